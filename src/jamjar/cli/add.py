@@ -12,7 +12,7 @@ import click
 from jamjar.core.config import Config
 from jamjar.core.database import Database
 from jamjar.core.managers.add import AddManager
-from jamjar.core.managers.auth import Auth
+from jamjar.core.managers.auth import fetch_access_token
 from jamjar.core.spotify import SpotifyAPI
 
 CONFIG = Config()
@@ -30,16 +30,16 @@ def add(playlist):
 
     :param playlist: The Spotify playlist URL or ID.
     """
-    access_token = Auth(CONFIG).get_access_token()
+    access_token = fetch_access_token(CONFIG)
     db = Database(CONFIG)
-    spotify_api = SpotifyAPI(access_token)
-    add_manager = AddManager(db, spotify_api)
+    with SpotifyAPI(access_token) as spotify_api:
+        add_manager = AddManager(db, spotify_api)
 
-    result = add_manager.add_playlist(playlist)
+        result = add_manager.add_playlist(playlist)
 
-    if result["status"] == "created":
-        print("Playlist added successfully.")
-        print(f"Playlist: {result['playlist_summary']['playlist']['name']}")
-        print(f"Tracks added: {len(result['tracks_summary']['added_tracks'])}")
-    else:
-        print("Error: Unexpected result: Add incomplete.")
+        if result["status"] == "created":
+            print("Playlist added successfully.")
+            print(f"Playlist: {result['playlist_summary']['playlist']['name']}")
+            print(f"Tracks added: {len(result['tracks_summary']['added_tracks'])}")
+        else:
+            print("Error: Unexpected result: Add incomplete.")
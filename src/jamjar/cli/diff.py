@@ -9,15 +9,14 @@ and the actual Spotify playlist. It generates a JSON diff of the differences in
 tracks and metadata.
 """
 
-import json
-
 import click
 
 from jamjar.core.config import Config
 from jamjar.core.database import Database
-from jamjar.core.managers.auth import Auth
+from jamjar.core.managers.auth import fetch_access_token
 from jamjar.core.managers.diff import DiffManager
 from jamjar.core.spotify import SpotifyAPI
+from jamjar.core.utils import print_json
 
 CONFIG = Config()
 
@@ -35,10 +34,10 @@ def diff(playlist, details):
     :param details: Flag to indicate whether detailed metadata differences should be shown.
     """
 
-    access_token = Auth(CONFIG).get_access_token()
+    access_token = fetch_access_token(CONFIG)
     db = Database(CONFIG)
-    spotify_api = SpotifyAPI(access_token)
-    diff_manager = DiffManager(db, spotify_api)
+    with SpotifyAPI(access_token) as spotify_api:
+        diff_manager = DiffManager(db, spotify_api)
 
-    diff_data = diff_manager.diff_playlist(playlist, details)
-    print(json.dumps(diff_data, indent=2))
+        diff_data = diff_manager.diff_playlist(playlist, details)
+        print_json(diff_data)
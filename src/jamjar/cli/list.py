@@ -9,13 +9,12 @@ or to list all tracks in a specific playlist, by fetching data from the database
 and displaying it in a structured format.
 """
 
-import json
-
 import click
 
 from jamjar.core.config import Config
 from jamjar.core.database import Database
 from jamjar.core.managers.list import ListManager
+from jamjar.core.utils import print_json
 
 CONFIG = Config()
 
@@ -43,4 +42,4 @@ def list(playlist=None):
     else:
         playlist_data = list_manager.list_playlists()
 
-    print(json.dumps(playlist_data, indent=2))
+    print_json(playlist_data)
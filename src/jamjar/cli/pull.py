@@ -12,7 +12,7 @@ import click
 
 from jamjar.core.config import Config
 from jamjar.core.database import Database
-from jamjar.core.managers.auth import Auth
+from jamjar.core.managers.auth import fetch_access_token
 from jamjar.core.managers.pull import PullManager
 from jamjar.core.spotify import SpotifyAPI
 
@@ -34,22 +34,22 @@ def pull(playlist, rm=False):
     :param playlist: The Spotify playlist ID or URL to synchronize.
     :param rm: If provided, removes tracks no longer in the Spotify playlist.
     """
-    access_token = Auth(CONFIG).get_access_token()
+    access_token = fetch_access_token(CONFIG)
     db = Database(CONFIG)
-    spotify_api = SpotifyAPI(access_token)
-    pull_manager = PullManager(db, spotify_api)
-
-    result = pull_manager.pull_playlist(playlist, rm)
-
-    if result["status"] == "created":
-        print("Playlist created in the database.")
-        print(f"Playlist: {result['data']['playlist_summary']['playlist']['name']}")
-    elif result["status"] == "updated":
-        print("Playlist synchronized successfully.")
-        print(f"Playlist: {result['playlist']['playlist']['name']}")
-        print(f"Tracks updated: {len(result['tracks']['added'])}")
-
-        if rm:
-            print(f"Tracks removed: {len(result['tracks']['removed'])}")
-    else:
-        print("Error: Unexpected result: Sync incomplete.")
+    with SpotifyAPI(access_token) as spotify_api:
+        pull_manager = PullManager(db, spotify_api)
+
+        result = pull_manager.pull_playlist(playlist, rm)
+
+        if result["status"] == "created":
+            print("Playlist created in the database.")
+            print(f"Playlist: {result['data']['playlist_summary']['playlist']['name']}")
+        elif result["status"] == "updated":
+            print("Playlist synchronized successfully.")
+            print(f"Playlist: {result['playlist']['playlist']['name']}")
+            print(f"Tracks updated: {len(result['tracks']['added'])}")
+
+            if rm:
+                print(f"Tracks removed: {len(result['tracks']['removed'])}")
+        else:
+            print("Error: Unexpected result: Sync incomplete.")
@@ -11,7 +11,7 @@ import click
 
 from jamjar.core.config import Config
 from jamjar.core.database import Database
-from jamjar.core.managers.auth import Auth
+from jamjar.core.managers.auth import fetch_access_token
 from jamjar.core.managers.push import PushManager
 from jamjar.core.spotify import SpotifyAPI
 
@@ -31,20 +31,20 @@ def push(playlist_id, name, description, public, image):
 
     :param playlist: The Spotify playlist URL or ID.
     """
-    access_token = Auth(CONFIG).get_access_token()
+    access_token = fetch_access_token(CONFIG)
     db = Database(CONFIG)
-    spotify_api = SpotifyAPI(access_token)
-    push_manager = PushManager(db, spotify_api)
-
-    if not name:
-        prompt = "Enter a name for the new playlist"
-        name = click.prompt(prompt, type=str)
-
-    try:
-        result = push_manager.push_playlist(playlist_id, name, description, public, image)
-        print(f"Playlist created: {result['playlist_url']}")
-        print(f"Tracks added: {result['track_count']}")
-        print(f"Public: {result['public']}")
-        print(f"Cover image uploaded: {result['image_uploaded']}")
-    except RuntimeError as e:
-        print(f"Error: {e}")
+    with SpotifyAPI(access_token) as spotify_api:
+        push_manager = PushManager(db, spotify_api)
+
+        if not name:
+            prompt = "Enter a name for the new playlist"
+            name = click.prompt(prompt, type=str)
+
+        try:
+            result = push_manager.push_playlist(playlist_id, name, description, public, image)
+            print(f"Playlist created: {result['playlist_url']}")
+            print(f"Tracks added: {result['track_count']}")
+            print(f"Public: {result['public']}")
+            print(f"Cover image uploaded: {result['image_uploaded']}")
+        except RuntimeError as e:
+            print(f"Error: {e}")
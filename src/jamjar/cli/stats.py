@@ -9,13 +9,12 @@ options are provided, general statistics (total counts) for playlists, tracks, a
 users are displayed.
 """
 
-import json
-
 import click
 
 from jamjar.core.config import Config
 from jamjar.core.database import Database
 from jamjar.core.managers.stats import StatsManager
+from jamjar.core.utils import print_json
 
 CONFIG = Config()
 
@@ -42,25 +41,25 @@ def stats(top_tracks, top_artists, top_users, recent_tracks):
 
     if top_tracks:
         top_tracks_data = stats_manager.get_top_tracks()
-        print(json.dumps(top_tracks_data, indent=2))
+        print_json(top_tracks_data)
         return
 
     if top_artists:
         top_artists_data = stats_manager.get_top_artists()
-        print(json.dumps(top_artists_data, indent=2))
+        print_json(top_artists_data)
         return
 
     if top_users:
         top_users_data = stats_manager.get_top_users()
-        print(json.dumps(top_users_data, indent=2))
+        print_json(top_users_data)
         return
 
     if recent_tracks:
         recent_tracks_data = stats_manager.get_recent_tracks()
-        print(json.dumps(recent_tracks_data, indent=2))
+        print_json(recent_tracks_data)
         return
 
     if not any([top_tracks, top_artists, top_users, recent_tracks]):
         stats_data = stats_manager.get_stats()
-        print(json.dumps(stats_data, indent=2))
+        print_json(stats_data)
         return
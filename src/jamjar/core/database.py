@@ -9,10 +9,37 @@ fetching playlists and spotify_tracks from the database.
 
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from jamjar.core.config import Config
-from jamjar.core.dataclasses import Playlist, Track
+from jamjar.core.dataclasses import (
+    PLAYLIST_FIELDS,
+    TRACK_FIELDS,
+    Playlist,
+    Track,
+    TrackTable,
+)
+
+# Column projections matching the field order of the dataclasses, so rows can be
+# unpacked positionally instead of relying on the DDL column order.
+_PLAYLIST_COLUMNS = ", ".join(PLAYLIST_FIELDS)
+_TRACK_COLUMNS = ", ".join(TRACK_FIELDS)
+_JOINED_COLUMNS = ", ".join(
+    [f"p.{field}" for field in PLAYLIST_FIELDS] + [f"t.{field}" for field in TRACK_FIELDS]
+)
+
+# Positions of the BOOLEAN columns in the projections above, SQLite returns them as 0/1.
+_PLAYLIST_BOOL_INDEXES = tuple(PLAYLIST_FIELDS.index(name) for name in ("public", "colaborative"))
+_TRACK_BOOL_INDEXES = tuple(TRACK_FIELDS.index(name) for name in ("is_explicit", "is_local"))
+
+
+def _convert_bools(row: tuple, indexes: tuple) -> list:
+    """Return the row's values with the columns at the given positions converted to bool."""
+    values = list(row)
+    for index in indexes:
+        values[index] = bool(values[index])
+
+    return values
 
 
 class DatabaseError(Exception):
@@ -35,6 +62,7 @@ class Database:
     def __init__(self, config: Config):
         self.db_path = Path(config.db_path).expanduser()
         self.connection = None
+        self._cursor = None
         self._initialize_database()
 
     def _connect(self):
@@ -42,7 +70,11 @@ class Database:
         try:
             if not self.connection:
                 self.connection = sqlite3.connect(self.db_path)
-                self.connection.row_factory = sqlite3.Row
+                self._cursor = self.connection.cursor()
+                self._cursor.execute("PRAGMA journal_mode = WAL")
+                self._cursor.execute("PRAGMA synchronous = NORMAL")
+                self._cursor.execute("PRAGMA temp_store = MEMORY")
+                self._cursor.execute("PRAGMA mmap_size = 268435456")
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
@@ -51,7 +83,7 @@ class Database:
         self._connect()
         try:
             with self.connection:
-                self.connection.execute(
+                self._cursor.execute(
                     """
                     CREATE TABLE IF NOT EXISTS spotify_playlist (
                         playlist_id VARCHAR(255) PRIMARY KEY NOT NULL,
@@ -72,7 +104,7 @@ class Database:
                 )
 
                 # pylint: disable=line-too-long
-                self.connection.execute(
+                self._cursor.execute(
                     """
                     CREATE TABLE IF NOT EXISTS spotify_tracks (
                         track_id VARCHAR(255) PRIMARY KEY NOT NULL,
@@ -98,9 +130,157 @@ class Database:
                     );
                     """
                 )
+
+                self._initialize_stats_cache()
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
+    def _initialize_stats_cache(self):
+        """
+        Initialize the stats cache tables and the triggers that maintain them.
+
+        The stats_cache table holds the totals returned by fetch_counts, while
+        stats_refs keeps a reference count per distinct artist, user and track name so
+        the distinct totals can be kept up to date without scanning spotify_tracks.
+        Rows are written with upserts, so the triggers stay correct on any connection,
+        regardless of the recursive_triggers pragma.
+        """
+
+        self._cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stats_cache (
+                key VARCHAR(255) PRIMARY KEY NOT NULL,
+                value INT NOT NULL DEFAULT 0
+            );
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stats_refs (
+                key VARCHAR(255) NOT NULL,
+                value VARCHAR(255) NOT NULL,
+                refs INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (key, value)
+            );
+            """
+        )
+
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_playlist_ins AFTER INSERT ON spotify_playlist
+            BEGIN
+                UPDATE stats_cache SET value = value + 1 WHERE key = 'playlists';
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_playlist_del AFTER DELETE ON spotify_playlist
+            BEGIN
+                UPDATE stats_cache SET value = value - 1 WHERE key = 'playlists';
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tracks_ins AFTER INSERT ON spotify_tracks
+            BEGIN
+                UPDATE stats_cache SET value = value + 1 WHERE key = 'tracks';
+                INSERT INTO stats_refs (key, value, refs)
+                VALUES
+                    ('artists', NEW.artist_name, 1),
+                    ('users', NEW.user_added, 1),
+                    ('unique_tracks', NEW.track_name, 1)
+                ON CONFLICT (key, value) DO UPDATE SET refs = refs + 1;
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tracks_del AFTER DELETE ON spotify_tracks
+            BEGIN
+                UPDATE stats_cache SET value = value - 1 WHERE key = 'tracks';
+                UPDATE stats_refs SET refs = refs - 1
+                WHERE (key = 'artists' AND value = OLD.artist_name)
+                   OR (key = 'users' AND value = OLD.user_added)
+                   OR (key = 'unique_tracks' AND value = OLD.track_name);
+                DELETE FROM stats_refs
+                WHERE refs <= 0 AND (
+                    (key = 'artists' AND value = OLD.artist_name)
+                    OR (key = 'users' AND value = OLD.user_added)
+                    OR (key = 'unique_tracks' AND value = OLD.track_name)
+                );
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tracks_upd
+            AFTER UPDATE OF artist_name, user_added, track_name ON spotify_tracks
+            BEGIN
+                INSERT INTO stats_refs (key, value, refs)
+                VALUES
+                    ('artists', NEW.artist_name, 1),
+                    ('users', NEW.user_added, 1),
+                    ('unique_tracks', NEW.track_name, 1)
+                ON CONFLICT (key, value) DO UPDATE SET refs = refs + 1;
+                UPDATE stats_refs SET refs = refs - 1
+                WHERE (key = 'artists' AND value = OLD.artist_name)
+                   OR (key = 'users' AND value = OLD.user_added)
+                   OR (key = 'unique_tracks' AND value = OLD.track_name);
+                DELETE FROM stats_refs
+                WHERE refs <= 0 AND (
+                    (key = 'artists' AND value = OLD.artist_name)
+                    OR (key = 'users' AND value = OLD.user_added)
+                    OR (key = 'unique_tracks' AND value = OLD.track_name)
+                );
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_refs_ins AFTER INSERT ON stats_refs
+            BEGIN
+                UPDATE stats_cache SET value = value + 1 WHERE key = NEW.key;
+            END;
+            """
+        )
+        self._cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_refs_del AFTER DELETE ON stats_refs
+            BEGIN
+                UPDATE stats_cache SET value = value - 1 WHERE key = OLD.key;
+            END;
+            """
+        )
+
+        # Seed the cache from the existing data the first time it is created.
+        if self._cursor.execute("SELECT COUNT(*) FROM stats_cache").fetchone()[0]:
+            return
+
+        self._cursor.execute("DELETE FROM stats_refs")
+        self._cursor.execute(
+            """
+            INSERT INTO stats_refs (key, value, refs)
+            SELECT 'artists', artist_name, COUNT(*) FROM spotify_tracks GROUP BY artist_name
+            UNION ALL
+            SELECT 'users', user_added, COUNT(*) FROM spotify_tracks GROUP BY user_added
+            UNION ALL
+            SELECT 'unique_tracks', track_name, COUNT(*) FROM spotify_tracks GROUP BY track_name
+            """
+        )
+        self._cursor.execute(
+            """
+            INSERT INTO stats_cache (key, value)
+            VALUES
+                ('playlists', (SELECT COUNT(*) FROM spotify_playlist)),
+                ('tracks', (SELECT COUNT(*) FROM spotify_tracks)),
+                ('artists', (SELECT COUNT(*) FROM stats_refs WHERE key = 'artists')),
+                ('users', (SELECT COUNT(*) FROM stats_refs WHERE key = 'users')),
+                ('unique_tracks', (SELECT COUNT(*) FROM stats_refs WHERE key = 'unique_tracks'))
+            """
+        )
+
     # pylint: disable=too-many-arguments
     # pylint: disable=too-many-positional-arguments
     def add_playlist(
@@ -122,14 +302,27 @@ class Database:
         """Add a playlist to the database."""
         try:
             with self.connection:
-                self.connection.execute(
+                self._cursor.execute(
                     """
-                    INSERT OR REPLACE INTO spotify_playlist (
+                    INSERT INTO spotify_playlist (
                         playlist_id, playlist_name, owner_id, owner_name, owner_url,
                         description, playlist_url, public, followers_total,
                         snapshot_id, playlist_image_url, track_count, colaborative
                     )
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (playlist_id) DO UPDATE SET
+                        playlist_name = excluded.playlist_name,
+                        owner_id = excluded.owner_id,
+                        owner_name = excluded.owner_name,
+                        owner_url = excluded.owner_url,
+                        description = excluded.description,
+                        playlist_url = excluded.playlist_url,
+                        public = excluded.public,
+                        followers_total = excluded.followers_total,
+                        snapshot_id = excluded.snapshot_id,
+                        playlist_image_url = excluded.playlist_image_url,
+                        track_count = excluded.track_count,
+                        colaborative = excluded.colaborative
                     """,
                     (
                         playlist_id,
@@ -179,9 +372,9 @@ class Database:
         """Add a track to the database."""
         try:
             with self.connection:
-                self.connection.execute(
+                self._cursor.execute(
                     """
-                    INSERT OR REPLACE INTO spotify_tracks (
+                    INSERT INTO spotify_tracks (
                         track_id,
                         track_name,
                         track_url,
@@ -203,6 +396,25 @@ class Database:
                         time_added
                     )
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (track_id) DO UPDATE SET
+                        track_name = excluded.track_name,
+                        track_url = excluded.track_url,
+                        track_uri = excluded.track_uri,
+                        preview_url = excluded.preview_url,
+                        track_popularity = excluded.track_popularity,
+                        album_id = excluded.album_id,
+                        album_name = excluded.album_name,
+                        album_url = excluded.album_url,
+                        artist_id = excluded.artist_id,
+                        artist_name = excluded.artist_name,
+                        artist_url = excluded.artist_url,
+                        is_explicit = excluded.is_explicit,
+                        is_local = excluded.is_local,
+                        disc_number = excluded.disc_number,
+                        isrc_code = excluded.isrc_code,
+                        playlist_id = excluded.playlist_id,
+                        user_added = excluded.user_added,
+                        time_added = excluded.time_added
                     """,
                     (
                         track_id,
@@ -229,41 +441,71 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
-    def delete_track(self, track_id: str, playlist_id: str):
-        """Delete a track from the database."""
+    def delete_track(self, track_id: str, playlist_id: str) -> Optional[str]:
+        """
+        Delete a track from the database.
+
+        :return Optional[str]: The name of the deleted track, or None if it did not exist.
+        """
         try:
             with self.connection:
-                self.connection.execute(
+                rows = self._cursor.execute(
                     """
                     DELETE FROM spotify_tracks
                     WHERE track_id = ? AND playlist_id = ?
+                    RETURNING track_name
                     """,
                     (
                         track_id,
                         playlist_id,
                     ),
-                )
+                ).fetchall()
+                return rows[0][0] if rows else None
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
-    def delete_playlist(self, playlist_id: str):
-        """Delete a playlist and its spotify_tracks from the database."""
+    def delete_tracks(self, track_ids: List[str], playlist_id: str):
+        """Delete multiple tracks of a playlist from the database in a single transaction."""
         try:
             with self.connection:
-                self.connection.execute(
+                # Stay well below SQLite's limit on the number of host parameters per statement.
+                for start in range(0, len(track_ids), 500):
+                    chunk = track_ids[start : start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    self._cursor.execute(
+                        f"""
+                        DELETE FROM spotify_tracks
+                        WHERE playlist_id = ? AND track_id IN ({placeholders})
+                        """,
+                        (playlist_id, *chunk),
+                    )
+        except sqlite3.Error as e:
+            raise DatabaseError(e) from e
+
+    def delete_playlist(self, playlist_id: str) -> Optional[str]:
+        """
+        Delete a playlist and its spotify_tracks from the database.
+
+        :return Optional[str]: The name of the deleted playlist, or None if it did not exist.
+        """
+        try:
+            with self.connection:
+                rows = self._cursor.execute(
                     """
                     DELETE FROM spotify_playlist
                     WHERE playlist_id = ?
+                    RETURNING playlist_name
                     """,
                     (playlist_id,),
-                )
-                self.connection.execute(
+                ).fetchall()
+                self._cursor.execute(
                     """
                     DELETE FROM spotify_tracks
                     WHERE playlist_id = ?
                     """,
                     (playlist_id,),
                 )
+                return rows[0][0] if rows else None
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
@@ -271,12 +513,12 @@ class Database:
         """Delete all playlists and their spotify_tracks from the database."""
         try:
             with self.connection:
-                self.connection.execute(
+                self._cursor.execute(
                     """
                     DELETE FROM spotify_playlist
                     """
                 )
-                self.connection.execute(
+                self._cursor.execute(
                     """
                     DELETE FROM spotify_tracks
                     """
@@ -295,13 +537,13 @@ class Database:
         try:
             with self.connection:
                 if playlist_id:
-                    query = "SELECT * FROM spotify_playlist WHERE playlist_id = ?"
+                    query = f"SELECT {_PLAYLIST_COLUMNS} FROM spotify_playlist WHERE playlist_id = ?"
                     params = (playlist_id,)
                 else:
-                    query = "SELECT * FROM spotify_playlist"
+                    query = f"SELECT {_PLAYLIST_COLUMNS} FROM spotify_playlist"
                     params = ()
 
-                rows = self.connection.execute(query, params).fetchall()
+                rows = self._cursor.execute(query, params).fetchall()
                 if playlist_id:
                     return self._row_to_playlist(rows[0]) if rows else None
 
@@ -309,23 +551,9 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
-    def _row_to_playlist(self, row: sqlite3.Row) -> Playlist:
-        """Convert a database row to a Playlist object."""
-        return Playlist(
-            playlist_id=row["playlist_id"],
-            playlist_name=row["playlist_name"],
-            owner_id=row["owner_id"],
-            owner_name=row["owner_name"],
-            owner_url=row["owner_url"],
-            description=row["description"],
-            playlist_url=row["playlist_url"],
-            public=bool(row["public"]),
-            followers_total=row["followers_total"],
-            snapshot_id=row["snapshot_id"],
-            playlist_image_url=row["playlist_image_url"],
-            track_count=row["track_count"],
-            colaborative=bool(row["colaborative"]),
-        )
+    def _row_to_playlist(self, row: tuple) -> Playlist:
+        """Convert a database row, selected with _PLAYLIST_COLUMNS, to a Playlist object."""
+        return Playlist(*_convert_bools(row, _PLAYLIST_BOOL_INDEXES))
 
     def fetch_tracks(
         self, playlist_id: Optional[str] = None, track_id: Optional[str] = None
@@ -341,16 +569,16 @@ class Database:
         try:
             with self.connection:
                 if track_id:
-                    query = "SELECT * FROM spotify_tracks WHERE track_id = ? AND playlist_id = ?"
+                    query = f"SELECT {_TRACK_COLUMNS} FROM spotify_tracks WHERE track_id = ? AND playlist_id = ?"
                     params = (track_id, playlist_id)
                 elif playlist_id:
-                    query = "SELECT * FROM spotify_tracks WHERE playlist_id = ? ORDER BY track_id DESC"
+                    query = f"SELECT {_TRACK_COLUMNS} FROM spotify_tracks WHERE playlist_id = ? ORDER BY track_id DESC"
                     params = (playlist_id,)
                 else:
-                    query = "SELECT * FROM spotify_tracks ORDER BY track_id DESC"
+                    query = f"SELECT {_TRACK_COLUMNS} FROM spotify_tracks ORDER BY track_id DESC"
                     params = ()
 
-                rows = self.connection.execute(query, params).fetchall()
+                rows = self._cursor.execute(query, params).fetchall()
                 if track_id:
                     return self._row_to_track(rows[0]) if rows else None
 
@@ -358,88 +586,62 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
-    def _row_to_track(self, row: sqlite3.Row) -> Track:
-        """Convert a database row to a Track object."""
-
-        return Track(
-            track_id=row["track_id"],
-            track_name=row["track_name"],
-            track_url=row["track_url"],
-            track_uri=row["track_uri"],
-            preview_url=row["preview_url"],
-            track_popularity=row["track_popularity"],
-            album_id=row["album_id"],
-            album_name=row["album_name"],
-            album_url=row["album_url"],
-            artist_id=row["artist_id"],
-            artist_name=row["artist_name"],
-            artist_url=row["artist_url"],
-            is_explicit=bool(row["is_explicit"]),
-            is_local=bool(row["is_local"]),
-            disc_number=row["disc_number"],
-            isrc_code=row["isrc_code"],
-            playlist_id=row["playlist_id"],
-            user_added=row["user_added"],
-            time_added=row["time_added"],
-        )
+    def fetch_playlist_with_tracks(self, playlist_id: str) -> Tuple[Optional[Playlist], TrackTable]:
+        """
+        Fetch a playlist and all its tracks with a single query.
 
-    def count_playlists(self) -> int:
-        """Fetch the total number of playlists in the database."""
-        try:
-            with self.connection:
-                return self.connection.execute(
-                    """
-                    SELECT COUNT(*) FROM spotify_playlist
-                    """
-                ).fetchone()[0]
-        except sqlite3.Error as e:
-            raise DatabaseError(e) from e
+        :param playlist_id (str): The unique identifier of the playlist to fetch.
+        :return Tuple[Optional[Playlist], TrackTable]: The playlist, or None if it does not
+            exist, and its tracks in the same order as fetch_tracks.
+        """
 
-    def count_tracks(self) -> int:
-        """Fetch the total number of spotify_tracks in the database."""
         try:
             with self.connection:
-                return self.connection.execute(
-                    """
-                    SELECT COUNT(*) FROM spotify_tracks
-                    """
-                ).fetchone()[0]
+                rows = self._cursor.execute(
+                    f"""
+                    SELECT {_JOINED_COLUMNS}
+                    FROM spotify_playlist p
+                    LEFT JOIN spotify_tracks t ON t.playlist_id = p.playlist_id
+                    WHERE p.playlist_id = ?
+                    ORDER BY t.track_id DESC
+                    """,
+                    (playlist_id,),
+                ).fetchall()
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
-    def count_artists(self) -> int:
-        """Fetch the total number of artists in the database."""
-        try:
-            with self.connection:
-                return self.connection.execute(
-                    """
-                    SELECT COUNT(DISTINCT artist_name) FROM spotify_tracks
-                    """
-                ).fetchone()[0]
-        except sqlite3.Error as e:
-            raise DatabaseError(e) from e
+        if not rows:
+            return None, TrackTable(())
 
-    def count_users(self) -> int:
-        """Fetch the total number of users who have added spotify_tracks to the database."""
-        try:
-            with self.connection:
-                return self.connection.execute(
-                    """
-                    SELECT COUNT(DISTINCT user_added) FROM spotify_tracks
-                    """
-                ).fetchone()[0]
-        except sqlite3.Error as e:
-            raise DatabaseError(e) from e
+        split = len(PLAYLIST_FIELDS)
+        playlist = self._row_to_playlist(rows[0][:split])
+
+        # A playlist without tracks yields a single row with NULL track columns.
+        if rows[0][split] is None:
+            return playlist, TrackTable(())
+
+        return playlist, TrackTable(self._row_to_values(row[split:]) for row in rows)
+
+    def _row_to_track(self, row: tuple) -> Track:
+        """Convert a database row, selected with _TRACK_COLUMNS, to a Track object."""
+        return Track(*self._row_to_values(row))
+
+    @staticmethod
+    def _row_to_values(row: tuple) -> list:
+        """Convert the boolean columns of a track row, selected with _TRACK_COLUMNS."""
+        return _convert_bools(row, _TRACK_BOOL_INDEXES)
+
+    def fetch_counts(self) -> dict:
+        """
+        Fetch all cached counters (playlists, tracks, artists, users and unique_tracks)
+        in a single query.
+
+        :return dict: A mapping of counter name to its value.
+        """
 
-    def count_unique_tracks(self) -> List[str]:
-        """Count the number of unique spotify_tracks in the database."""
         try:
             with self.connection:
-                return self.connection.execute(
-                    """
-                    SELECT COUNT(DISTINCT track_name) FROM spotify_tracks
-                    """
-                ).fetchone()[0]
+                return dict(self._cursor.execute("SELECT key, value FROM stats_cache").fetchall())
         except sqlite3.Error as e:
             raise DatabaseError(e) from e
 
@@ -447,7 +649,7 @@ class Database:
         """Fetch the top spotify_tracks in the database based on the number of playlists they appear in."""
         try:
             with self.connection:
-                rows = self.connection.execute(
+                rows = self._cursor.execute(
                     """
                     SELECT track_name, artist_name, COUNT(*) as occurrences
                     FROM spotify_tracks
@@ -473,7 +675,7 @@ class Database:
         """Fetch the top artists in the database based on the number of playlists their tracks appear in."""
         try:
             with self.connection:
-                rows = self.connection.execute(
+                rows = self._cursor.execute(
                     """
                     SELECT artist_name, COUNT(*) as occurrences
                     FROM spotify_tracks
@@ -498,7 +700,7 @@ class Database:
         """Fetch the top users in the database based on the number of spotify_tracks they've added."""
         try:
             with self.connection:
-                rows = self.connection.execute(
+                rows = self._cursor.execute(
                     """
                     SELECT user_added, COUNT(track_id) AS count
                     FROM spotify_tracks
@@ -523,7 +725,7 @@ class Database:
         """Fetch the most recently added spotify_tracks in the database across all playlists."""
         try:
             with self.connection:
-                rows = self.connection.execute(
+                rows = self._cursor.execute(
                     """
                     SELECT p.playlist_name, t.track_name, t.artist_name, t.user_added, t.time_added
                     FROM spotify_tracks t
@@ -550,5 +752,7 @@ class Database:
     def close(self):
         """Close the database connection."""
         if self.connection:
+            self._cursor.close()
+            self._cursor = None
             self.connection.close()
             self.connection = None
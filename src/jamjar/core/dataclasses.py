@@ -5,11 +5,13 @@ This module defines the dataclasses used in the JamJar CLI.
 """
 
 # pylint: disable=import-self
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Iterable
 
 
 # pylint: disable=too-many-instance-attributes
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Playlist:
     """Dataclass for storing playlist information."""
 
@@ -29,25 +31,11 @@ class Playlist:
 
     def _asdict(self):
         """Return the playlist data as a dictionary."""
-        return {
-            "playlist_id": self.playlist_id,
-            "playlist_name": self.playlist_name,
-            "owner_id": self.owner_id,
-            "owner_name": self.owner_name,
-            "owner_url": self.owner_url,
-            "playlist_url": self.playlist_url,
-            "description": self.description,
-            "public": self.public,
-            "followers_total": self.followers_total,
-            "snapshot_id": self.snapshot_id,
-            "playlist_image_url": self.playlist_image_url,
-            "track_count": self.track_count,
-            "colaborative": self.colaborative,
-        }
+        return dict(zip(PLAYLIST_FIELDS, _PLAYLIST_VALUES(self)))
 
 
 # pylint: disable=too-many-instance-attributes
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Track:
     """Dataclass for storing track information."""
 
@@ -73,24 +61,44 @@ class Track:
 
     def _asdict(self):
         """Return the track data as a dictionary."""
-        return {
-            "track_id": self.track_id,
-            "track_name": self.track_name,
-            "track_url": self.track_url,
-            "track_uri": self.track_uri,
-            "preview_url": self.preview_url,
-            "track_popularity": self.track_popularity,
-            "album_id": self.album_id,
-            "album_name": self.album_name,
-            "album_url": self.album_url,
-            "artist_id": self.artist_id,
-            "artist_name": self.artist_name,
-            "artist_url": self.artist_url,
-            "is_explicit": self.is_explicit,
-            "is_local": self.is_local,
-            "disc_number": self.disc_number,
-            "isrc_code": self.isrc_code,
-            "playlist_id": self.playlist_id,
-            "user_added": self.user_added,
-            "time_added": self.time_added,
-        }
+        return dict(zip(TRACK_FIELDS, _TRACK_VALUES(self)))
+
+
+PLAYLIST_FIELDS = tuple(field.name for field in fields(Playlist))
+TRACK_FIELDS = tuple(field.name for field in fields(Track))
+
+# Fetch all field values of an instance in a single call, in *_FIELDS order.
+_PLAYLIST_VALUES = attrgetter(*PLAYLIST_FIELDS)
+_TRACK_VALUES = attrgetter(*TRACK_FIELDS)
+
+
+# pylint: disable=too-few-public-methods
+class TrackTable:
+    """
+    Column-oriented collection of tracks.
+
+    Each Track field is stored as a single tuple holding that field for every track,
+    so bulk access to one field (e.g. all track URIs) does not need a Track per row.
+    """
+
+    __slots__ = TRACK_FIELDS + ("_length",)
+
+    def __init__(self, rows: Iterable[tuple]):
+        """
+        Build the table from rows whose values are in TRACK_FIELDS order.
+
+        :param rows: The track rows to store.
+        """
+
+        columns = tuple(zip(*rows)) or ((),) * len(TRACK_FIELDS)
+        for name, column in zip(TRACK_FIELDS, columns):
+            setattr(self, name, column)
+
+        self._length = len(columns[0])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def row(self, index: int) -> Track:
+        """Materialize the track at the given index as a Track object."""
+        return Track(*(getattr(self, name)[index] for name in TRACK_FIELDS))
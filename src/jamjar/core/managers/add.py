@@ -57,15 +57,18 @@ class AddManager:
 
         :param playlist_id: The Spotify playlist ID.
         :param tracks_data: A dictionary containing track data fetched from Spotify.
-        :return: A summary of the operation.
+        :return: A summary of the operation, including the IDs of all tracks in the playlist.
         """
 
         added_tracks = []
+        spotify_track_ids = set()
         for track_item in tracks_data.get("items", []):
             track = track_item.get("track")
             if not track or not track.get("id"):
                 continue
 
+            spotify_track_ids.add(track["id"])
+
             track_info = {
                 "track_id": track["id"],
                 "track_name": track["name"],
@@ -101,7 +104,11 @@ class AddManager:
             except Exception as e:
                 raise AddError(f"Failed to add track '{track_info['track_name']}': {e}") from e
 
-        return {"status": "success", "added_tracks": added_tracks}
+        return {
+            "status": "success",
+            "added_tracks": added_tracks,
+            "spotify_track_ids": spotify_track_ids,
+        }
 
     def add_playlist_to_db(self, playlist_id: str, playlist_data: dict) -> dict:
         """
@@ -143,20 +150,28 @@ class AddManager:
         except Exception as e:
             raise AddError(f"Failed to add playlist metadata: {e}") from e
 
-    def add_playlist(self, playlist_identifier: str) -> dict:
+    def add_playlist(
+        self,
+        playlist_identifier: str,
+        *,
+        prefetched_playlist: dict = None,
+        prefetched_tracks: dict = None,
+    ) -> dict:
         """
         Add a Spotify playlist to the database by URL or ID.
 
         :param playlist_identifier: A Spotify playlist URL or ID.
+        :param prefetched_playlist: Playlist details already fetched from Spotify, if any.
+        :param prefetched_tracks: Track data already fetched from Spotify, if any.
         :return: A summary of the operation.
         :raises AddError: If an error occurs during the addition process.
         """
         try:
             playlist_id = extract_playlist_id(playlist_identifier)
-            playlist_data = self._get_playlist_data(playlist_id)
+            playlist_data = prefetched_playlist or self._get_playlist_data(playlist_id)
 
             playlist_summary = self.add_playlist_to_db(playlist_id, playlist_data)
-            tracks_data = self.spotify_api.get_playlist_tracks(playlist_id)
+            tracks_data = prefetched_tracks or self.spotify_api.get_playlist_tracks(playlist_id)
             tracks_summary = self.add_tracks_to_db(playlist_id, tracks_data)
 
             return {
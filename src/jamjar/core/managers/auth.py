@@ -9,14 +9,24 @@ logging in, refreshing the access token, and storing the token.
 
 import json
 import os
+import threading
+import time
 import urllib.parse
-from datetime import datetime
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from jamjar.core.config import Config
 
+# Refresh the access token when it expires within this many seconds, so requests
+# started right before the expiry don't fail in-flight.
+REFRESH_SKEW_SECONDS = 60
+
+# How long the local HTTP server waits for the Spotify callback.
+CALLBACK_TIMEOUT_SECONDS = 120
+
 
 class AuthError(Exception):
     """Exception raised for authentication errors."""
@@ -26,6 +36,18 @@ class AuthError(Exception):
         super().__init__(self.message)
 
 
+class _CallbackHTTPServer(HTTPServer):
+    """HTTP server for the Spotify callback, which stops waiting after a fixed timeout."""
+
+    timeout = CALLBACK_TIMEOUT_SECONDS
+
+    def __init__(self, server_address, handler_class, auth):
+        super().__init__(server_address, handler_class)
+        self.auth = auth
+        self.token_info = None
+
+
+# pylint: disable=too-many-instance-attributes
 class Auth:
     """
     Handles the Spotify authentication flow.
@@ -42,6 +64,14 @@ class Auth:
         self.client_secret = config.client_secret
         self.redirect_uri = config.redirect_uri
         self.token_file = os.path.expanduser(config.token_file)
+        self._token_cache = None
+        self._token_mtime = 0
+        self._refresh_lock = threading.Lock()
+
+        retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        self._session.mount("https://", adapter)
 
     def generate_auth_url(self) -> str:
         """Generates the Spotify authorization URL."""
@@ -104,10 +134,18 @@ class Auth:
                     """Suppress log messages."""
                     return
 
-            server = HTTPServer(("localhost", 5000), CallbackHandler)
-            server.auth = self
-            server.handle_request()
-            return getattr(server, "token_info", None)
+            server = _CallbackHTTPServer(("localhost", 5000), CallbackHandler, self)
+
+            # Keep serving until the callback arrived, so stray requests don't end the login.
+            deadline = time.monotonic() + CALLBACK_TIMEOUT_SECONDS
+            try:
+                while server.token_info is None and time.monotonic() < deadline:
+                    server.timeout = deadline - time.monotonic()
+                    server.handle_request()
+            finally:
+                server.server_close()
+
+            return server.token_info
         except Exception as e:
             raise AuthError(f"Failed to start HTTP server: {e}") from e
 
@@ -120,40 +158,50 @@ class Auth:
             "client_id": self.client_id,
             "client_secret": self.client_secret,
         }
-        response = requests.post(self.token_url, data=body, timeout=10)
+        response = self._session.post(self.token_url, data=body, timeout=10)
         response.raise_for_status()
         token_info = response.json()
-        token_info["expires_at"] = datetime.now().timestamp() + token_info["expires_in"]
+        token_info["expires_at"] = time.time() + token_info["expires_in"]
         return token_info
 
     def refresh_token(self) -> dict:
         """Refreshes the access token if it has expired."""
-        token_info = self.load_token()
-        if not token_info or "refresh_token" not in token_info:
-            return {"error": "Refresh token not found. Please log in again."}
-
-        if datetime.now().timestamp() < token_info["expires_at"]:
+        token_info = self._get_cached_token()
+        if token_info and "refresh_token" in token_info and self._is_token_fresh(token_info):
             return token_info
 
-        body = {
-            "grant_type": "refresh_token",
-            "refresh_token": token_info["refresh_token"],
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-        }
-        response = requests.post(self.token_url, data=body, timeout=10)
-        response.raise_for_status()
-        new_token_info = response.json()
-        new_token_info["refresh_token"] = token_info["refresh_token"]
-        new_token_info["expires_at"] = datetime.now().timestamp() + new_token_info["expires_in"]
-        self.verify_token(new_token_info)
-        self.save_token(new_token_info)
-        return new_token_info
+        with self._refresh_lock:
+            # Another caller may have refreshed the token while we were waiting for the lock.
+            token_info = self.load_token()
+            if not token_info or "refresh_token" not in token_info:
+                return {"error": "Refresh token not found. Please log in again."}
+
+            if self._is_token_fresh(token_info):
+                return token_info
+
+            body = {
+                "grant_type": "refresh_token",
+                "refresh_token": token_info["refresh_token"],
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
+            response = self._session.post(self.token_url, data=body, timeout=10)
+            response.raise_for_status()
+            new_token_info = response.json()
+            new_token_info["refresh_token"] = token_info["refresh_token"]
+            new_token_info["expires_at"] = time.time() + new_token_info["expires_in"]
+            self.verify_token(new_token_info)
+            self.save_token(new_token_info)
+            return new_token_info
+
+    def _is_token_fresh(self, token_info: dict) -> bool:
+        """Checks whether the token stays valid for at least REFRESH_SKEW_SECONDS."""
+        return time.time() < token_info["expires_at"] - REFRESH_SKEW_SECONDS
 
     def verify_token(self, token_info: dict) -> dict:
         """Verifies the validity of the access token."""
         headers = {"Authorization": f"Bearer {token_info['access_token']}"}
-        response = requests.get(f"{self.base_url}/me", headers=headers, timeout=10)
+        response = self._session.get(f"{self.base_url}/me", headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -162,19 +210,37 @@ class Auth:
         with open(self.token_file, "w", encoding="utf-8") as f:
             json.dump(token_info, f)
 
+        self._token_cache = token_info
+        self._token_mtime = os.stat(self.token_file).st_mtime_ns
+
     def load_token(self) -> dict:
-        """Loads token info from a file."""
-        if not os.path.exists(self.token_file):
+        """Loads token info from a file, only re-reading it when it has changed."""
+        try:
+            mtime = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
+            self._token_cache = None
             return None
+
+        if self._token_cache is not None and mtime == self._token_mtime:
+            return self._token_cache
+
         with open(self.token_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+            self._token_cache = json.load(f)
+        self._token_mtime = mtime
+        return self._token_cache
+
+    def _get_cached_token(self) -> dict:
+        """Returns the token held in memory, only loading it from disk when none is cached."""
+        if self._token_cache is None:
+            return self.load_token()
+        return self._token_cache
 
     def get_access_token(self) -> str:
         """Returns the access token."""
-        token_info = self.load_token()
+        token_info = self._get_cached_token()
         if not token_info:
             raise AuthError("Access token not found. Please log in.")
-        if datetime.now().timestamp() > token_info["expires_at"]:
+        if not self._is_token_fresh(token_info):
             token_info = self.refresh_token()
         return token_info["access_token"]
 
@@ -184,4 +250,26 @@ class Auth:
             raise AuthError("Access token not found.")
 
         os.remove(self.token_file)
+        self._token_cache = None
         return {"status": "success"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the HTTP session used for the Spotify requests."""
+        self._session.close()
+
+
+def fetch_access_token(config: Config) -> str:
+    """
+    Return a valid access token, closing the Auth HTTP session afterwards.
+
+    :param config: The JamJar configuration.
+    :return str: The access token.
+    """
+    with Auth(config) as auth:
+        return auth.get_access_token()
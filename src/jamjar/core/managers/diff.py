@@ -9,8 +9,10 @@ and the actual Spotify playlist. It generates a JSON diff of the differences in
 tracks and metadata.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from jamjar.core.database import Database
-from jamjar.core.dataclasses import Playlist, Track
+from jamjar.core.dataclasses import PLAYLIST_FIELDS, Playlist, Track
 from jamjar.core.spotify import SpotifyAPI
 from jamjar.core.utils import extract_playlist_id
 
@@ -40,6 +42,42 @@ class DiffManager:
         self.db = db
         self.spotify_api = spotify_api
 
+    def _item_to_track(self, item: dict, playlist_id: str) -> Track:
+        """
+        Convert a playlist item returned by Spotify to a Track object.
+
+        :param item: A playlist item, as returned by the Spotify API.
+        :param playlist_id: The ID of the Spotify playlist the item belongs to.
+        :return: A Track object representing the track of the item.
+        """
+
+        track = item["track"]
+        album = track["album"]
+        artist = track["artists"][0]
+        added_by = item.get("added_by") or {}
+
+        return Track(
+            track_id=track["id"],
+            track_name=track["name"],
+            track_url=track["external_urls"].get("spotify"),
+            track_uri=track["uri"],
+            preview_url=track.get("preview_url"),
+            track_popularity=track["popularity"],
+            album_id=album["id"],
+            album_name=album["name"],
+            album_url=album.get("external_urls", {}).get("spotify"),
+            artist_id=artist["id"],
+            artist_name=artist["name"],
+            artist_url=artist.get("external_urls", {}).get("spotify"),
+            is_explicit=track["explicit"],
+            is_local=track.get("is_local", False),
+            disc_number=track.get("disc_number", 1),
+            isrc_code=track.get("external_ids", {}).get("isrc", ""),
+            playlist_id=playlist_id,
+            user_added=added_by.get("id", ""),
+            time_added=item["added_at"],
+        )
+
     def _fetch_spotify_playlist_tracks(self, playlist_id: str) -> list[Track]:
         """
         Fetch all tracks from a Spotify playlist using the provided playlist ID.
@@ -51,30 +89,7 @@ class DiffManager:
         try:
             response = self.spotify_api.get_playlist_tracks(playlist_id)
             items = response.get("items", [])
-            return [
-                Track(
-                    track_id=item["track"]["id"],
-                    track_name=item["track"]["name"],
-                    track_url=item["track"]["external_urls"].get("spotify"),
-                    track_uri=item["track"]["uri"],
-                    preview_url=item["track"].get("preview_url"),
-                    track_popularity=item["track"]["popularity"],
-                    album_id=item["track"]["album"]["id"],
-                    album_name=item["track"]["album"]["name"],
-                    album_url=item["track"]["album"].get("external_urls", {}).get("spotify"),
-                    artist_id=item["track"]["artists"][0]["id"],
-                    artist_name=item["track"]["artists"][0]["name"],
-                    artist_url=item["track"]["artists"][0].get("external_urls", {}).get("spotify"),
-                    is_explicit=item["track"]["explicit"],
-                    is_local=item["track"].get("is_local", False),
-                    disc_number=item["track"].get("disc_number", 1),
-                    isrc_code=item["track"].get("external_ids", {}).get("isrc", ""),
-                    playlist_id=playlist_id,
-                    user_added=item.get("added_by", {}).get("id", ""),
-                    time_added=item["added_at"],
-                )
-                for item in items
-            ]
+            return [self._item_to_track(item, playlist_id) for item in items]
         except Exception as e:
             raise DiffError(f"Error fetching Spotify playlist tracks: {e}") from e
 
@@ -143,17 +158,15 @@ class DiffManager:
         """
 
         try:
-            db_track_ids = {track.track_id for track in db_tracks}
-            spotify_track_ids = {track.track_id for track in spotify_tracks}
+            db_by_id = {track.track_id: track for track in db_tracks}
+            spotify_by_id = {track.track_id: track for track in spotify_tracks}
 
-            added_tracks = []
-            removed_tracks = []
-            for track in spotify_tracks:
-                if track.track_id not in db_track_ids:
-                    added_tracks.append(track._asdict())
-
-                if track.track_id not in spotify_track_ids:
-                    removed_tracks.append(track._asdict())
+            added_tracks = [
+                track._asdict() for key, track in spotify_by_id.items() if key not in db_by_id
+            ]
+            removed_tracks = [
+                track._asdict() for key, track in db_by_id.items() if key not in spotify_by_id
+            ]
 
             return {"added": added_tracks, "removed": removed_tracks}
         except Exception as e:
@@ -170,13 +183,16 @@ class DiffManager:
         """
 
         try:
-            metadata_diff = {}
-            db_values = db_playlist._asdict()
-            spotify_values = spotify_playlist._asdict()
+            # The generated dataclass equality compares all fields in one go.
+            if db_playlist == spotify_playlist:
+                return {"metadata_changed": None}
 
-            for key in db_values:
-                if db_values[key] != spotify_values[key]:
-                    metadata_diff[key] = {"db": db_values[key], "spotify": spotify_values[key]}
+            metadata_diff = {}
+            for field in PLAYLIST_FIELDS:
+                db_value = getattr(db_playlist, field)
+                spotify_value = getattr(spotify_playlist, field)
+                if db_value != spotify_value:
+                    metadata_diff[field] = {"db": db_value, "spotify": spotify_value}
 
             # pylint: disable=line-too-long
             return {"metadata_changed": metadata_diff} if metadata_diff else {"metadata_changed": None}
@@ -194,10 +210,18 @@ class DiffManager:
 
         try:
             playlist_id = extract_playlist_id(playlist_identifier)
-            db_playlist = self._fetch_database_playlist_metadata(playlist_id)
-            spotify_playlist = self._fetch_spotify_playlist_metadata(playlist_id)
-            db_tracks = self._fetch_database_playlist_tracks(playlist_id)
-            spotify_tracks = self._fetch_spotify_playlist_tracks(playlist_id)
+
+            # The Spotify requests run in the background while the database is queried,
+            # the SQLite connection itself can only be used from the current thread.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                metadata_future = pool.submit(self._fetch_spotify_playlist_metadata, playlist_id)
+                tracks_future = pool.submit(self._fetch_spotify_playlist_tracks, playlist_id)
+
+                db_playlist = self._fetch_database_playlist_metadata(playlist_id)
+                db_tracks = self._fetch_database_playlist_tracks(playlist_id)
+                spotify_playlist = metadata_future.result()
+                spotify_tracks = tracks_future.result()
+
             generated_diff = self._generate_tracks_diff(db_tracks, spotify_tracks)
 
             if detailed:
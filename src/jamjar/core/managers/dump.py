@@ -8,8 +8,16 @@ from a database to a structured JSON file.
 """
 
 import json
+import os
+import re
+import tempfile
 
 from jamjar.core.database import Database
+from jamjar.core.dataclasses import Playlist, Track
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+_UNSAFE_NAME_RE = re.compile(r"[\W_]")
 
 
 class DumpError(Exception):
@@ -39,6 +47,26 @@ class DumpManager:
 
         self.db = db
 
+    def _write_export(self, f, playlist: Playlist, tracks: list[Track]):
+        """
+        Stream the export data to a file, one track at a time.
+
+        The tracks are encoded one per line, instead of building the complete export
+        in memory and pretty-printing it in one go.
+
+        :param f: The file object to write the JSON data to.
+        :param playlist: The Playlist object holding the playlist metadata.
+        :param tracks: The Track objects of the playlist.
+        """
+
+        f.write('{"metadata": ')
+        f.write(json.dumps(playlist._asdict()))
+        f.write(', "tracks": [')
+        for index, track in enumerate(tracks):
+            f.write(",\n  " if index else "\n  ")
+            f.write(json.dumps(track._asdict()))
+        f.write("\n]}\n")
+
     def dump_playlist(self, playlist_identifier: str, output_file: str = None) -> dict:
         """
         Export a playlist's data to a JSON file.
@@ -64,17 +92,36 @@ class DumpManager:
             if not tracks:
                 raise ValueError(f"No tracks found for playlist with ID {playlist_identifier}.")
 
-            export_data = {
-                "metadata": playlist._asdict(),
-                "tracks": [track._asdict() for track in tracks],
-            }
-
             if not output_file:
-                safe_name = "".join(c if c.isalnum() else "_" for c in playlist.playlist_name)
+                safe_name = _UNSAFE_NAME_RE.sub("_", playlist.playlist_name)
                 output_file = f"{safe_name}.json"
 
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2)
+            # Write to a temporary file next to the output file and move it in place once
+            # complete, so a failed export never leaves a truncated file behind.
+            output_dir, output_name = os.path.split(output_file)
+            # pylint: disable=consider-using-with
+            f = tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                buffering=WRITE_BUFFER_SIZE,
+                dir=output_dir or ".",
+                prefix=f".{output_name}.",
+                delete=False,
+            )
+            try:
+                # Most of the export is only flushed to disk when the file is closed, so the
+                # close is covered by the cleanup as well.
+                with f:
+                    self._write_export(f, playlist, tracks)
+
+                # Temporary files are created private, give the export the usual permissions.
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(f.name, 0o666 & ~umask)
+                os.replace(f.name, output_file)
+            except Exception:
+                os.remove(f.name)
+                raise
 
             return {
                 "status": "success",
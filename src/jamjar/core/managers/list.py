@@ -10,6 +10,7 @@ and displaying it in a structured format.
 """
 
 from jamjar.core.database import Database
+from jamjar.core.dataclasses import Playlist, Track
 from jamjar.core.utils import extract_playlist_id
 
 
@@ -54,7 +55,7 @@ class ListManager:
             if not playlists:
                 raise ListError("No playlists found in the database.")
 
-            return {"playlists": [playlist._asdict() for playlist in playlists]}
+            return {"playlists": list(map(Playlist._asdict, playlists))}
 
         except Exception as e:
             raise ListError(f"Failed to list playlists: {e}") from e
@@ -76,6 +77,6 @@ class ListManager:
             if not tracks:
                 raise ListError(f"No tracks found for playlist ID {playlist_id}.")
 
-            return {"tracks": [track._asdict() for track in tracks]}
+            return {"tracks": list(map(Track._asdict, tracks))}
         except Exception as e:
             raise ListError(f"Failed to list tracks: {e}") from e
@@ -10,7 +10,6 @@ present in the Spotify playlist.
 
 from jamjar.core.database import Database
 from jamjar.core.managers.add import AddManager
-from jamjar.core.managers.rm import RemoveManager
 from jamjar.core.spotify import SpotifyAPI
 from jamjar.core.utils import extract_playlist_id
 
@@ -62,14 +61,17 @@ class PullManager:
             if not spotify_playlist:
                 raise PullError(f"Playlist with ID {playlist_id} not found on Spotify.")
 
+            tracks_data = self.spotify_api.get_playlist_tracks(playlist_id)
+
             if not self.db.fetch_playlists(playlist_id):
-                add_result = self.add_manager.add_playlist(playlist_identifier)
+                add_result = self.add_manager.add_playlist(
+                    playlist_identifier,
+                    prefetched_playlist=spotify_playlist,
+                    prefetched_tracks=tracks_data,
+                )
                 return add_result
 
-            playlist_data = self.spotify_api.get_playlist(playlist_id)
-            tracks_data = self.spotify_api.get_playlist_tracks(playlist_id)
-
-            playlist_result = self.add_manager.add_playlist_to_db(playlist_id, playlist_data)
+            playlist_result = self.add_manager.add_playlist_to_db(playlist_id, spotify_playlist)
             added_tracks_result = self.add_manager.add_tracks_to_db(playlist_id, tracks_data)
             return_result = {
                 "status": "updated",
@@ -78,7 +80,8 @@ class PullManager:
             }
 
             if rm:
-                removed_tracks_result = self._remove_deleted_tracks(playlist_id, tracks_data)
+                spotify_track_ids = added_tracks_result["spotify_track_ids"]
+                removed_tracks_result = self._remove_deleted_tracks(playlist_id, spotify_track_ids)
                 return_result["tracks"]["removed"] = removed_tracks_result["removed_tracks"]
 
             return return_result
@@ -86,7 +89,7 @@ class PullManager:
         except Exception as e:
             raise PullError(f"Failed to sync playlist: {e}") from e
 
-    def _remove_deleted_tracks(self, playlist_id: str, spotify_tracks: dict) -> dict:
+    def _remove_deleted_tracks(self, playlist_id: str, spotify_track_ids: set) -> dict:
         """
         Remove tracks from the database that are no longer in the Spotify playlist.
 
@@ -94,19 +97,17 @@ class PullManager:
         and removes tracks from the database that are missing in Spotify.
 
         :param playlist_id: The Spotify playlist ID.
-        :param spotify_tracks: A dictionary of tracks fetched from Spotify.
+        :param spotify_track_ids: The IDs of the tracks currently in the Spotify playlist.
         :return: A summary of the track removal operation.
         """
         try:
-            rm_manager = RemoveManager(self.db)
-            spotify_track_ids = {item["track"]["id"] for item in spotify_tracks.get("items", [])}
             local_tracks = self.db.fetch_tracks(playlist_id)
-            removed_tracks = []
+            deleted = [track for track in local_tracks if track.track_id not in spotify_track_ids]
 
-            for local_track in local_tracks:
-                if local_track.track_id not in spotify_track_ids:
-                    removed_track = rm_manager.remove_track(playlist_id, local_track.track_id)
-                    removed_tracks.append(removed_track)
+            self.db.delete_tracks([track.track_id for track in deleted], playlist_id)
+            removed_tracks = [
+                {"status": "removed", "removed_track": track.track_name} for track in deleted
+            ]
 
             return {"status": "removed", "removed_tracks": removed_tracks}
         except Exception as e:
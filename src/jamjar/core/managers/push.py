@@ -8,6 +8,9 @@ API to create a new playlist, add tracks to it, and set a cover image.
 """
 
 import base64
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from jamjar.core.database import Database
 from jamjar.core.spotify import SpotifyAPI
@@ -74,7 +77,13 @@ class PushManager:
         """
 
         with open(image_path, "rb") as image:
-            return base64.b64encode(image.read()).decode("utf-8")
+            # mmap refuses to map empty files.
+            if os.fstat(image.fileno()).st_size == 0:
+                return ""
+
+            # Encode straight from the mapped pages, without reading the file into a bytes copy.
+            with mmap.mmap(image.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return base64.b64encode(mapped).decode("ascii")
 
     def _post_playlist(self, user_id: str, playlist_data: dict) -> dict:
         """
@@ -91,9 +100,12 @@ class PushManager:
         """
         Add tracks to a Spotify playlist.
 
+        Spotify accepts at most 100 tracks per request, larger lists are split into
+        batches by the SpotifyAPI.
+
         :param playlist_id: The Spotify playlist ID.
         :param track_uris: A list of Spotify track URIs.
-        :return: The response from the Spotify API.
+        :return: The snapshot IDs returned by the Spotify API for each batch.
         """
 
         return self.spotify_api.post_tracks(playlist_id, track_uris)
@@ -108,6 +120,16 @@ class PushManager:
 
         return self.spotify_api.post_image(playlist_id, image_data)
 
+    def _upload_image(self, playlist_id: str, image_path: str):
+        """
+        Encode an image file and set it as the cover image of a Spotify playlist.
+
+        :param playlist_id: The Spotify playlist ID.
+        :param image_path: The path to the image file.
+        """
+
+        return self._post_image(playlist_id, self._encode_image(image_path))
+
     # pylint: disable=too-many-arguments
     # pylint: disable=too-many-positional-arguments
     # pylint: disable=line-too-long
@@ -125,11 +147,10 @@ class PushManager:
         :return: A dictionary summarizing the actions performed.
         """
         try:
-            playlist = self.db.fetch_playlists(playlist_id)
+            playlist, tracks = self.db.fetch_playlist_with_tracks(playlist_id)
             if not playlist:
                 raise PushError(f"Playlist with ID {playlist_id} not found.")
 
-            tracks = self.db.fetch_tracks(playlist_id)
             if not tracks:
                 raise PushError(f"No tracks found for playlist with ID {playlist_id}.")
 
@@ -147,8 +168,16 @@ class PushManager:
             playlist_id = response_create_playlist["id"]
             playlist_url = response_create_playlist["external_urls"]["spotify"]
 
-            track_uris = [track.track_uri for track in tracks]
-            response_add_tracks = self._post_playlist_tracks(playlist_id, track_uris)
+            # Adding the tracks and uploading the cover only depend on the new playlist,
+            # so both are sent concurrently.
+            track_uris = tracks.track_uri
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                tracks_future = pool.submit(self._post_playlist_tracks, playlist_id, track_uris)
+                image_future = pool.submit(self._upload_image, playlist_id, image) if image else None
+
+                response_add_tracks = tracks_future.result()
+                response_add_image = image_future.result() if image_future else None
+
             if not response_add_tracks:
                 raise PushError("Failed to add tracks to the playlist.")
 
@@ -161,9 +190,6 @@ class PushManager:
             }
 
             if image:
-                image_data = self._encode_image(image)
-                response_add_image = self._post_image(playlist_id, image_data)
-
                 if not response_add_image:
                     raise PushError("Failed to upload cover image to the playlist.")
 
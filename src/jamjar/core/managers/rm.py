@@ -46,15 +46,13 @@ class RemoveManager:
         """
 
         try:
-            playlist = self.db.fetch_playlists(playlist_id)
-            if not playlist:
+            playlist_name = self.db.delete_playlist(playlist_id)
+            if playlist_name is None:
                 raise RemoveError(f"Playlist with ID '{playlist_id}' not found.")
 
-            self.db.delete_playlist(playlist_id)
-
             return {
                 "status": "removed",
-                "removed_playlist": playlist.playlist_name,
+                "removed_playlist": playlist_name,
             }
         except Exception as e:
             raise RemoveError(f"Failed to remove playlist: {e}") from e
@@ -68,18 +66,14 @@ class RemoveManager:
         """
 
         try:
-            print(playlist_id, track_id)
-            track = self.db.fetch_tracks(playlist_id, track_id)
-            print(track)
-            if not track:
+            track_name = self.db.delete_track(track_id, playlist_id)
+            if track_name is None:
                 err_msg = f"Track with ID '{track_id}' not found in playlist '{playlist_id}'."
                 raise RemoveError(err_msg)
 
-            self.db.delete_track(track_id, playlist_id)
-
             return {
                 "status": "removed",
-                "removed_track": track.track_name,
+                "removed_track": track_name,
             }
         except Exception as e:
             raise RemoveError(f"Failed to remove track: {e}") from e
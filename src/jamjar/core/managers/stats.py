@@ -79,18 +79,14 @@ class StatsManager:
         """Fetch and display general statistics about the database."""
 
         try:
-            total_playlists = self.db.count_playlists()
-            total_tracks = self.db.count_tracks()
-            unique_tracks = self.db.count_unique_tracks()
-            total_artists = self.db.count_artists()
-            total_users = self.db.count_users()
+            counts = self.db.fetch_counts()
 
             return {
-                "total_playlists": total_playlists,
-                "total_tracks": total_tracks,
-                "unique_tracks": unique_tracks,
-                "total_artists": total_artists,
-                "total_users": total_users,
+                "total_playlists": counts["playlists"],
+                "total_tracks": counts["tracks"],
+                "unique_tracks": counts["unique_tracks"],
+                "total_artists": counts["artists"],
+                "total_users": counts["users"],
             }
         except Exception as e:
             raise StatsError(f"Error fetching general statistics: {str(e)}") from e
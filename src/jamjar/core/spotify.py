@@ -7,8 +7,36 @@ This module provides a class for interacting with the Spotify API, including
 fetching playlist details and tracks.
 """
 
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Maximum number of playlist track pages fetched concurrently, kept low to stay
+# clear of Spotify's rate limits.
+PAGE_WORKERS = 5
+
+# Sustained number of requests per second sent to Spotify, and the size of the
+# burst allowed on top of that.
+RATE_LIMIT = 10.0
+RATE_LIMIT_BURST = 20
+
+# Maximum number of tracks Spotify accepts in a single "add items" request.
+MAX_TRACKS_PER_REQUEST = 100
+
+
+def _decode(response: requests.Response):
+    """
+    Decode the JSON body of a response.
+
+    The raw bytes are handed to json.loads directly, which detects the UTF encoding
+    itself, instead of decoding the body to a str first as Response.json() does.
+    """
+    return json.loads(response.content)
 
 
 class SpotifyError(Exception):
@@ -24,6 +52,41 @@ class SpotifyHTTPError(SpotifyError):
         super().__init__(self.message)
 
 
+class LeakyBucket:
+    """
+    Paces requests to a sustained rate, while allowing short bursts.
+
+    The bucket is shared by all threads using the same SpotifyAPI instance.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 0.0
+                self._last = time.monotonic()
+            else:
+                self._tokens -= 1
+
+    def drain(self):
+        """Empty the bucket, so subsequent requests are sent at the sustained rate."""
+        with self._lock:
+            self._tokens = 0.0
+            self._last = time.monotonic()
+
+
 class SpotifyAPI:
     """
     Handles the Spotify API requests for the JamJar CLI.
@@ -32,81 +95,136 @@ class SpotifyAPI:
     the Spotify API.
     """
 
+    # Extra headers for the cover image upload, the Authorization header is set once on the session.
+    _JPEG_HEADERS = {"Content-Type": "image/jpeg"}
+
     def __init__(self, access_token):
         self.access_token = access_token
         self.base_url = "https://api.spotify.com/v1"
 
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.headers.update({"Authorization": f"Bearer {access_token}"})
+        self._bucket = LeakyBucket(rate=RATE_LIMIT, capacity=RATE_LIMIT_BURST)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the HTTP session used for the Spotify requests."""
+        self._session.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request to the Spotify API, paced by the rate limiter."""
+        self._bucket.acquire()
+        response = self._session.request(method, url, timeout=10, **kwargs)
+        if response.status_code == 429:
+            self._bucket.drain()
+
+        return response
+
     def get_playlist(self, playlist_id):
         """Fetch playlist details from Spotify."""
         url = f"{self.base_url}/playlists/{playlist_id}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers, timeout=10)
-        return response.json()
+        response = self._request("GET", url)
+        return _decode(response)
 
-    def get_playlist_tracks(self, playlist_id):
-        """Fetch the tracks of a specific playlist from Spotify."""
+    def _get_playlist_tracks_page(self, playlist_id: str, offset: int = 0, limit: int = 100):
+        """Fetch a single page of tracks of a specific playlist from Spotify."""
         url = f"{self.base_url}/playlists/{playlist_id}/tracks"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        all_tracks = []
+        params = {"offset": offset, "limit": limit}
+
+        response = self._request("GET", url, params=params)
+        response.raise_for_status()
+        return _decode(response)
 
-        while url:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            all_tracks.extend(data["items"])
-            url = data.get("next")
+    def get_playlist_tracks_pages(self, playlist_id: str, offsets, limit: int = 100) -> list:
+        """Fetch the track pages at the given offsets concurrently, in the order of the offsets."""
+        if not offsets:
+            return []
+
+        def fetch_page(offset):
+            return self._get_playlist_tracks_page(playlist_id, offset, limit)
+
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(offsets))) as executor:
+            return list(executor.map(fetch_page, offsets))
+
+    def get_playlist_tracks(self, playlist_id):
+        """Fetch the tracks of a specific playlist from Spotify."""
+        first_page = self._get_playlist_tracks_page(playlist_id)
+        items = first_page["items"]
+
+        # The first page holds the total, so the remaining pages can be fetched concurrently
+        # and copied into a list of the final size.
+        total = first_page.get("total", len(items))
+        all_tracks = [None] * max(total, len(items))
+        all_tracks[: len(items)] = items
+        filled = len(items)
+
+        limit = first_page.get("limit") or 100
+        offsets = range(limit, total, limit)
+        for page in self.get_playlist_tracks_pages(playlist_id, offsets, limit):
+            items = page["items"]
+            all_tracks[filled : filled + len(items)] = items
+            filled += len(items)
+
+        # Trim the unused slots when the playlist shrank while it was being fetched.
+        del all_tracks[filled:]
 
         return {"items": all_tracks}
 
     def get_user_id(self):
         """Fetch the user ID from Spotify."""
         url = f"{self.base_url}/me"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self._request("GET", url)
         if response.status_code != 200:
             raise SpotifyHTTPError(response)
 
-        return response.json()["id"]
+        return _decode(response)["id"]
 
     def post_playlist(self, user_id: str, playlist_data: dict):
         """Post a playlist to Spotify."""
         url = f"{self.base_url}/users/{user_id}/playlists"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
-
-        response = requests.post(url, headers=headers, json=playlist_data, timeout=10)
+        response = self._request("POST", url, json=playlist_data)
         if response.status_code != 201:
             raise SpotifyHTTPError(response)
 
-        return response.json()
+        return _decode(response)
 
     def post_tracks(self, playlist_id: str, track_uris: list):
-        """Add tracks to a Spotify playlist."""
+        """Add tracks to a Spotify playlist, in batches of at most MAX_TRACKS_PER_REQUEST."""
         url = f"{self.base_url}/playlists/{playlist_id}/tracks"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
-        data = {"uris": track_uris}
+        snapshot_ids = []
 
-        response = requests.post(url, headers=headers, json=data, timeout=10)
-        if response.status_code != 201:
-            raise SpotifyHTTPError(response)
+        for position in range(0, len(track_uris), MAX_TRACKS_PER_REQUEST):
+            data = {
+                "uris": track_uris[position : position + MAX_TRACKS_PER_REQUEST],
+                "position": position,
+            }
+
+            response = self._request("POST", url, json=data)
+            if response.status_code != 201:
+                raise SpotifyHTTPError(response)
 
-        return response.json()
+            snapshot_ids.append(_decode(response)["snapshot_id"])
+
+        return {"snapshot_ids": snapshot_ids}
 
     def post_image(self, playlist_id: str, image_data: str):
         """Add a cover image to a Spotify playlist."""
         url = f"{self.base_url}/playlists/{playlist_id}/images"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "image/jpeg",
-        }
-
-        response = requests.put(url, headers=headers, data=image_data, timeout=10)
+        response = self._request("PUT", url, headers=self._JPEG_HEADERS, data=image_data)
         if response.status_code != 202:
             raise SpotifyHTTPError(response)
 
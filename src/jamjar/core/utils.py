@@ -4,11 +4,26 @@
 Module for utility functions used in the JamJar CLI.
 """
 
+import json
+import sys
+
 
 def extract_playlist_id(playlist_identifier):
     """
     Extracts the playlist ID from a URL or uses the ID directly if given.
     """
-    if "/" in playlist_identifier:
-        return playlist_identifier.split("/")[-1].split("?")[0]
-    return playlist_identifier
+    # rfind returns -1 when there is no "/", so a bare ID is sliced from the start.
+    start = playlist_identifier.rfind("/") + 1
+    end = playlist_identifier.find("?", start)
+    return playlist_identifier[start:end] if end != -1 else playlist_identifier[start:]
+
+
+def print_json(data):
+    """
+    Print data as indented JSON to stdout.
+
+    The document is written in chunks as it is encoded, so large listings are never
+    held in memory as a single string.
+    """
+    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write("\n")
@@ -4,117 +4,155 @@
 Basic script to migrate the JamJar database over from v0.4.0 to a new schema
 introduced in v0.5.0.
 """
+import fcntl
 import os
-import shutil
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
+# ioctl request to clone a file's blocks on copy-on-write filesystems (Btrfs, XFS, ...).
+FICLONE = 0x40049409
 
-def add_track_uri_column(database_path):
-    """Add a new column 'track_uri' to the 'spotify_tracks' table in the database."""
 
-    connection = sqlite3.connect(database_path)
-    cursor = connection.cursor()
+def reflink(source_path, target_path):
+    """
+    Clone a file without copying its data, by sharing its blocks with the source.
+
+    Returns False when the filesystem does not support cloning.
+    """
 
     try:
-        backup_path = f"{database_path}.bak"
-        shutil.copy2(database_path, backup_path)
+        with open(source_path, "rb") as source, open(target_path, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    except OSError:
+        return False
 
-        print("Backup created:", backup_path)
-    except:
-        # pylint: disable=broad-exception-raised
-        raise Exception("Backup failed.") from None
+    return True
 
-    try:
 
-        cursor.execute(
-            """
-            ALTER TABLE spotify_tracks
-            ADD COLUMN track_uri VARCHAR(255);
-        """
-        )
-        print("Column 'track_uri' added.")
+def backup_database(database_path, backup_path):
+    """
+    Copy a database page by page through SQLite's online backup API.
 
-        cursor.execute(
-            """
-            UPDATE spotify_tracks
-            SET track_uri = 'spotify:track:' || track_id;
-        """
-        )
-        print("Column 'track_uri' populated with data.")
-
-        cursor.execute("SELECT COUNT(*) FROM spotify_tracks WHERE track_uri IS NULL;")
-        null_count = cursor.fetchone()[0]
-        if null_count > 0:
-            raise ValueError(f"""There are {null_count} NULL values in 'track_uri'. Exiting...""")
-
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS spotify_tracks_temp AS
-            SELECT
-                track_id,
-                track_name,
-                track_url,
-                track_uri,
-                preview_url,
-                track_popularity,
-                album_id,
-                album_name,
-                album_url,
-                artist_id,
-                artist_name,
-                artist_url,
-                is_explicit,
-                is_local,
-                disc_number,
-                isrc_code,
-                playlist_id,
-                user_added,
-                time_added
-            FROM spotify_tracks;
-        """
-        )
-        cursor.execute("DROP TABLE spotify_tracks;")
-
-        # pylint: disable=line-too-long
-        cursor.execute(
-            """
-            CREATE TABLE spotify_tracks (
-                track_id VARCHAR(255) PRIMARY KEY NOT NULL,
-                track_name VARCHAR(255) NOT NULL,
-                track_url VARCHAR(255) NOT NULL,
-                track_uri VARCHAR(255) NOT NULL,
-                preview_url VARCHAR(255),
-                track_popularity INT NOT NULL DEFAULT 0,
-                album_id VARCHAR(255) NOT NULL,
-                album_name VARCHAR(255) NOT NULL,
-                album_url VARCHAR(255) NOT NULL,
-                artist_id VARCHAR(255) NOT NULL,
-                artist_name VARCHAR(255) NOT NULL,
-                artist_url VARCHAR(255) NOT NULL,
-                is_explicit BOOLEAN NOT NULL DEFAULT FALSE,
-                is_local BOOLEAN NOT NULL DEFAULT FALSE,
-                disc_number INT NOT NULL DEFAULT 1,
-                isrc_code VARCHAR(50),
-                playlist_id VARCHAR(255) NOT NULL,
-                user_added VARCHAR(255) NOT NULL,
-                time_added DATETIME NOT NULL,
-                FOREIGN KEY (playlist_id) REFERENCES spotify_playlist (playlist_id) ON DELETE CASCADE
-            );
+    The copy is made from a separate connection, so it can run while another connection
+    migrates the database. In WAL mode, that connection only sees committed pages.
+    """
+
+    with closing(sqlite3.connect(database_path)) as source:
+        with closing(sqlite3.connect(backup_path)) as backup:
+            source.backup(backup)
+
+
+def populate_track_uri(cursor):
+    """
+    Add the 'track_uri' column, fill it in and make it NOT NULL.
+
+    Opens the migration transaction, committing it is up to the caller.
+    """
+
+    # executescript() commits any pending transaction before running, so the
+    # transaction is opened by the script itself. A failing statement leaves it open
+    # for the caller to roll back.
+    cursor.executescript(
         """
-        )
-        cursor.execute(
-            """
-            INSERT INTO spotify_tracks SELECT * FROM spotify_tracks_temp;
+        BEGIN IMMEDIATE;
+
+        ALTER TABLE spotify_tracks
+        ADD COLUMN track_uri VARCHAR(255);
+
+        UPDATE spotify_tracks
+        SET track_uri = 'spotify:track:' || track_id;
+    """
+    )
+    print("Column 'track_uri' added.")
+    print("Column 'track_uri' populated with data.")
+
+    # The NOT NULL constraint is added by editing the stored table definition in place,
+    # instead of copying the whole table into a new one. See "Making Other Kinds Of Table
+    # Schema Changes" in the SQLite ALTER TABLE docs.
+    schema_version = cursor.execute("PRAGMA schema_version;").fetchone()[0]
+    cursor.execute("PRAGMA writable_schema = ON;")
+    cursor.execute(
         """
-        )
-        cursor.execute("DROP TABLE spotify_tracks_temp;")
-        print("Column 'track_uri' is now NOT NULL.")
+        UPDATE sqlite_master
+        SET sql = replace(sql, 'track_uri VARCHAR(255)', 'track_uri VARCHAR(255) NOT NULL')
+        WHERE type = 'table' AND name = 'spotify_tracks';
+    """
+    )
+    cursor.execute(f"PRAGMA schema_version = {schema_version + 1};")
+    cursor.execute("PRAGMA writable_schema = OFF;")
+
+    # The integrity check validates every row against the new definition, so it also
+    # reports any track_uri the UPDATE left NULL.
+    problems = [row[0] for row in cursor.execute("PRAGMA integrity_check(spotify_tracks);")]
+    if problems != ["ok"]:
+        raise ValueError(f"Integrity check failed after altering 'spotify_tracks': {problems}")
+    print("Column 'track_uri' is now NOT NULL.")
 
-        connection.commit()
+
+def add_track_uri_column(database_path):
+    """Add a new column 'track_uri' to the 'spotify_tracks' table in the database."""
+
+    # Transactions are managed explicitly, so the whole migration, including the
+    # ALTER TABLE, is committed (or rolled back) at once.
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    cursor = connection.cursor()
+
+    # Nothing to do, not even a backup, when the column is already there and NOT NULL.
+    columns = {row[1]: row[3] for row in cursor.execute("PRAGMA table_info(spotify_tracks);")}
+    if columns.get("track_uri"):
+        print("Column 'track_uri' already exists, skipping migration.")
+        connection.close()
+        return
+
+    # Same journal settings as the application uses, plus a larger page cache for the
+    # full-table UPDATE.
+    cursor.execute("PRAGMA journal_mode = WAL;")
+    cursor.execute("PRAGMA synchronous = NORMAL;")
+    cursor.execute("PRAGMA temp_store = MEMORY;")
+    cursor.execute("PRAGMA cache_size = -65536;")
+    cursor.execute("PRAGMA mmap_size = 268435456;")
+
+    # The migration never changes playlist_id, so the foreign key doesn't need to be checked
+    # for every updated row. SQLite's schema edit procedure also requires foreign keys to be
+    # off, which can only be changed outside a transaction.
+    cursor.execute("PRAGMA foreign_keys = OFF;")
+
+    backup_path = f"{database_path}.bak"
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Once the WAL is fully checkpointed, the database file holds every committed page
+            # and can be cloned in constant time on copy-on-write filesystems. Otherwise it is
+            # copied in the background while the migration runs.
+            backup_future = None
+            busy = cursor.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()[0]
+            if busy or not reflink(database_path, backup_path):
+                backup_future = pool.submit(backup_database, database_path, backup_path)
+
+            populate_track_uri(cursor)
+
+            # The migration is only committed once the backup is complete, so the backup
+            # never contains any of it.
+            if backup_future:
+                try:
+                    backup_future.result()
+                except (OSError, sqlite3.Error) as e:
+                    raise RuntimeError(f"Backup failed: {e}") from e
+            print("Backup created:", backup_path)
+
+            cursor.execute("COMMIT;")
+
+        # Refresh the query planner statistics for the altered table, and fold the WAL
+        # written by the migration back into the database file.
+        cursor.execute("PRAGMA analysis_limit = 400;")
+        cursor.execute("PRAGMA optimize;")
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE);")
 
     except Exception as e:
-        connection.rollback()
+        if connection.in_transaction:
+            cursor.execute("ROLLBACK;")
         raise RuntimeError(f"Migration failed: {e}") from e
 
     finally: